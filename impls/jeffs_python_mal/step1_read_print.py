@@ -1,108 +1,65 @@
 import readline  # noqa: F401
 from dataclasses import dataclass
 from typing import Iterable
+import re
 import string
+import sys
 
 
 @dataclass(frozen=True)
 class LeftParen():
+    text = "("
+
     def __str__(self) -> str:
-        return "("
+        return self.text
 
 
 @dataclass(frozen=True)
 class RightParen:
+    text = ")"
+
     def __str__(self) -> str:
-        return ")"
+        return self.text
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Symbol:
     name: str
 
+    @property
+    def text(self) -> str:
+        return self.name
+
     def __str__(self) -> str:
         return self.name
 
 
 Token = LeftParen | RightParen | Symbol | str | int
 
-_INT_CHARS = set(string.digits)
-_PRINTABLE_ASCII_CHARS = set(string.printable)
-_WHITESPACE_CHARS = set(string.whitespace + ",")
-_SYMBOL_CHARS = _PRINTABLE_ASCII_CHARS - _WHITESPACE_CHARS
-_PARENS = {"(", ")"}
-
-
-def _scan_symbol(source: str, symbol_start_index: int) -> tuple[Symbol, int]:
-    """
-    Given a source code string and the index of the first character of a
-    symbol, return the symbol token and the new index to continue lexing
-    at (the index of the first character after the symbol token)
-
-    >>> _scan_symbol('foo bar baz', 4)
-    (Symbol(name='bar'), 7)
-    >>> _scan_symbol('x', 0)
-    (Symbol(name='x'), 1)
-    """
-    for index, char in enumerate(source[symbol_start_index:]):
-        if char in _WHITESPACE_CHARS:
-            symbol_name = source[symbol_start_index:index + symbol_start_index]
-            return (Symbol(symbol_name),
-                    index + symbol_start_index)
-
-    symbol_name = source[symbol_start_index:len(source)]
-    return (Symbol(symbol_name), len(source))
-
-
-def _scan_int(source: str, int_start_index: int) -> tuple[int, int]:
-    """
-    Given a source code string and the index of the first digit on an int,
-    return the int token and the new index to continue lexing at (the index of
-    the first character after the int token)
-
-    >>> _scan_int('foo 123 baz', 4)
-    (123, 7)
-    >>> _scan_int('0', 0)
-    (0, 1)
-    >>> _scan_int('5)', 0)
-    (5, 1)
-    >>> _scan_int('0invalid', 0)
-    Traceback (most recent call last):
-     ...
-    ValueError: invalid literal for int() with base 10: '0invalid'
-    """
-    for index, char in enumerate(source[int_start_index:]):
-        if char in _WHITESPACE_CHARS | _PARENS:
-            return (int(source[int_start_index:index + int_start_index]),
-                    index + int_start_index)
-
-    return (int(source[int_start_index:len(source)]), len(source))
-
-
-def _scan_str(source: str, str_start_index: int) -> tuple[str, int]:
-    """
-    Given a source code string and the index of a double-quote that starts
-    a string token, return the string token and the new index to continue
-    lexing at (the index of the first character after the string token's
-    double quote)
-
-    >>> _scan_str('foo "bar" baz', 4)
-    ('bar', 9)
-    >>> _scan_str('"bar"', 0)
-    ('bar', 5)
-    >>> _scan_str('foo "bar baz', 4)
-    Traceback (most recent call last):
-     ...
-    Exception: unbalanced quotes starting at 4
-    """
-    current_char_index = str_start_index + 1
-    while current_char_index < len(source):
-        if source[current_char_index] == '"':
-            return (source[str_start_index + 1:current_char_index],
-                    current_char_index + 1)
-        current_char_index += 1
+# Parens are frozen and carry no state, so every token can share one instance
+_LEFT_PAREN = LeftParen()
+_RIGHT_PAREN = RightParen()
 
-    raise Exception(f"unbalanced quotes starting at {str_start_index}")
+_PRINTABLE_ASCII_CHARS = frozenset(string.printable)
+_WHITESPACE_CHARS = frozenset(string.whitespace + ",")
+_SYMBOL_CHARS = _PRINTABLE_ASCII_CHARS - _WHITESPACE_CHARS
+# An unterminated string should fail to lex, not scan as a symbol, so a
+# symbol may contain a double quote but not start with one
+_SYMBOL_START_CHARS = _SYMBOL_CHARS - {'"'}
+
+# One precompiled alternation covers every token shape, so lex() makes a
+# single C-level match per token instead of dispatching per character.
+# Group order matters: ints must be tried before symbols so that tokens
+# starting with a digit are scanned (and validated) as ints.
+_TOKEN_RE = re.compile("|".join((
+    f"(?P<whitespace>[{re.escape(string.whitespace + ',')}]+)",
+    r"(?P<left_paren>\()",
+    r"(?P<right_paren>\))",
+    r'(?P<string>"[^"]*")',
+    f"(?P<int>[0-9][^{re.escape(string.whitespace + ',()')}]*)",
+    f"(?P<symbol>[{re.escape(''.join(sorted(_SYMBOL_START_CHARS)))}]"
+    f"[^{re.escape(string.whitespace + ',')}]*)",
+)))
 
 
 def lex(source: str) -> Iterable[Token]:
@@ -123,41 +80,45 @@ def lex(source: str) -> Iterable[Token]:
     Traceback (most recent call last):
      ...
     Exception: Non-printable-ASCII character at 0
+    >>> list(lex('foo "bar baz'))
+    Traceback (most recent call last):
+     ...
+    Exception: unbalanced quotes starting at 4
+    >>> list(lex('0invalid'))
+    Traceback (most recent call last):
+     ...
+    ValueError: invalid literal for int() with base 10: '0invalid'
     """
+    # Bind hot globals to locals: LOAD_FAST is cheaper than LOAD_GLOBAL
+    # in this per-token loop
+    token_match = _TOKEN_RE.match
+    source_length = len(source)
     current_char_index = 0
-    while current_char_index < len(source):
-        if source[current_char_index] not in _PRINTABLE_ASCII_CHARS:
+    while current_char_index < source_length:
+        match = token_match(source, current_char_index)
+        if match is None:
+            if source[current_char_index] == '"':
+                raise Exception(
+                    f"unbalanced quotes starting at {current_char_index}"
+                )
             raise Exception(
                 f"Non-printable-ASCII character at {current_char_index}"
             )
-        if source[current_char_index] == "(":
-            current_char_index += 1
-            yield LeftParen()
-        elif source[current_char_index] == ")":
-            current_char_index += 1
-            yield RightParen()
-        elif source[current_char_index] == '"':
-            string_token, new_char_index = _scan_str(source,
-                                                     current_char_index)
-            current_char_index = new_char_index
-            yield string_token
-        elif source[current_char_index] in _INT_CHARS:
-            int_token, new_char_index = _scan_int(source,
-                                                  current_char_index)
-            current_char_index = new_char_index
-            yield int_token
-        elif source[current_char_index] in _SYMBOL_CHARS:
-            symbol_token, new_char_index = _scan_symbol(source,
-                                                        current_char_index)
-            current_char_index = new_char_index
-            yield symbol_token
-        elif source[current_char_index] == '"':
-            str_token, new_char_index = _scan_str(source,
-                                                  current_char_index)
-            current_char_index = new_char_index
-            yield str_token
-        else:
-            current_char_index += 1
+        current_char_index = match.end()
+        kind = match.lastgroup
+        if kind == "symbol":
+            # The same symbols ("+", "def!", ...) recur constantly, so
+            # intern their names to share one string per distinct symbol
+            yield Symbol(sys.intern(match.group()))
+        elif kind == "int":
+            yield int(match.group())
+        elif kind == "string":
+            yield match.group()[1:-1]
+        elif kind == "left_paren":
+            yield _LEFT_PAREN
+        elif kind == "right_paren":
+            yield _RIGHT_PAREN
+        # whitespace produces no token
 
 
 def READ(source: str) -> Iterable[Token]:
@@ -169,32 +130,26 @@ def EVAL(tokens: Iterable[Token]) -> Iterable[Token]:
 
 
 def _preceed_with_space(previous: Token | None, current: Token) -> bool:
-    if not previous:
-        return False
-
-    # `None` here means a non-paren token
-    previous_token_type = (
-        previous if isinstance(previous, LeftParen | RightParen)
-        else None
-    )
-    current_token_type = (
-        current if isinstance(current, LeftParen | RightParen)
-        else None
-    )
-
-    rules: dict[tuple[LeftParen | RightParen | None, LeftParen | RightParen | None], bool] = {
-        (None, LeftParen()): True,            # "something ("
-        (None, RightParen()): False,          # "something)"
-        (None, None): True,                   # "something something"
-        (LeftParen(), LeftParen()): False,    # "(("
-        (LeftParen(), RightParen()): False,   # "()"
-        (LeftParen(), None): False,           # "(something"
-        (RightParen(), LeftParen()): True,    # ") ("
-        (RightParen(), RightParen()): False,  # "))"
-        (RightParen(), None): True,           # ") something"
-    }
-
-    return rules[(previous_token_type, current_token_type)]
+    # A space goes between any two tokens, except after a "(" or before a ")"
+    return (previous is not None
+            and not isinstance(previous, LeftParen)
+            and not isinstance(current, RightParen))
+
+
+def _token_strs(tokens: Iterable[Token]) -> Iterable[str]:
+    """
+    Yield the printed form of each token, with separating spaces, one
+    token at a time
+    """
+    preceed_with_space = _preceed_with_space
+    previous: Token | None = None
+    for current in tokens:
+        current_str = f'"{current}"' if isinstance(current, str) else str(current)
+        if preceed_with_space(previous, current):
+            yield " " + current_str
+        else:
+            yield current_str
+        previous = current
 
 
 def PRINT(tokens: Iterable[Token]) -> str:
@@ -213,24 +168,18 @@ def PRINT(tokens: Iterable[Token]) -> str:
     >>> PRINT(READ('"abc"'))
     '"abc"'
     """
-    strs: list[str] = []
-    previous: Token | None = None
-    for current in tokens:
-        current_str = f'"{current}"' if isinstance(current, str) else str(current)
-        if _preceed_with_space(previous, current):
-            strs.append(" ")
-        strs.append(current_str)
-        previous = current
-
-    return "".join(strs)
+    return "".join(_token_strs(tokens))
 
 
 if __name__ == "__main__":
     while True:
         try:
             source = input("user> ")
-            tokens = READ(source)
-            print(PRINT(EVAL(tokens)))
+            # Tokens stream straight from lex() to stdout, so only one
+            # token is ever live at a time
+            for token_str in _token_strs(EVAL(READ(source))):
+                sys.stdout.write(token_str)
+            sys.stdout.write("\n")
         except EOFError:
             break
         except Exception as e:
@@ -1,23 +1,36 @@
 import readline  # noqa: F401
+import re
+import sys
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import chain, pairwise
+from typing import Iterable
 
 
 @dataclass(frozen=True)
 class LeftParen():
+    text = "("
+
     def __str__(self) -> str:
-        return "("
+        return self.text
 
 
 @dataclass(frozen=True)
 class RightParen:
+    text = ")"
+
     def __str__(self) -> str:
-        return ")"
+        return self.text
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Symbol:
     name: str
 
+    @property
+    def text(self) -> str:
+        return self.name
+
     def __str__(self) -> str:
         return self.name
 
@@ -26,83 +39,99 @@ class Symbol:
 class StringToken:
     value: str
 
-    def __str__(self) -> str:
+    # Tokens are immutable, so the quoted form is built at most once per
+    # instance no matter how often it is printed
+    @cached_property
+    def text(self) -> str:
         return f'"{self.value}"'
 
+    def __str__(self) -> str:
+        return self.text
+
 
 Token = LeftParen | RightParen | Symbol | StringToken | int
 
+# Parens are frozen and carry no state, so every token can share one instance
+_LEFT_PAREN = LeftParen()
+_RIGHT_PAREN = RightParen()
+
+_INT_RE = re.compile(r"[0-9]+")
+_SYMBOL_RE = re.compile(r"[^ \n\t,;()]+")
 
-def read_str(source: str) -> tuple[StringToken, str]:
-    result = ""
-    for index, char in enumerate(source):
-        if char == '"':
-            return (StringToken(result), source[index + 1:])
-        result += char
-    raise EOFError("unbalanced quotes")
 
+def read_str(source: str, str_start_index: int) -> tuple[StringToken, int]:
+    closing_quote_index = source.find('"', str_start_index + 1)
+    if closing_quote_index == -1:
+        raise EOFError("unbalanced quotes")
+    return (StringToken(source[str_start_index + 1:closing_quote_index]),
+            closing_quote_index + 1)
 
-def read_int(source: str) -> tuple[int, str]:
-    result = ""
-    for index, char in enumerate(source):
-        if char not in "0123456789":
-            return (int(result), source[index:])
-        result += char
-    return (int(result), "")
 
+def read_int(source: str, int_start_index: int) -> tuple[int, int]:
+    match = _INT_RE.match(source, int_start_index)
+    return (int(match.group()), match.end())
 
-def read_symbol(source: str) -> tuple[Symbol, str]:
-    result = ""
-    for index, char in enumerate(source):
-        if char in " \n\t,;()":
-            return (Symbol(result), source[index:])
-        result += char
-    return (Symbol(result), "")
 
+def read_symbol(source: str, symbol_start_index: int) -> tuple[Symbol, int]:
+    match = _SYMBOL_RE.match(source, symbol_start_index)
+    # The same symbols ("+", "def!", ...) recur constantly, so intern
+    # their names to share one string per distinct symbol
+    return (Symbol(sys.intern(match.group())), match.end())
 
-def READ(source: str) -> list[Token]:
+
+@lru_cache(maxsize=256)
+def READ(source: str) -> tuple[Token, ...]:
     """
     Given a source code string, return tokens
 
+    REPL users resubmit nearly identical lines, so results are memoized
+    per source string; tokens are all immutable, so handing back the
+    cached tuple is safe
+
     >>> READ("()")
-    [LeftParen(), RightParen()]
+    (LeftParen(), RightParen())
 
     >>> READ('( "foo")')
-    [LeftParen(), StringToken(value='foo'), RightParen()]
+    (LeftParen(), StringToken(value='foo'), RightParen())
 
     >>> READ('( () 3 "foo" 12')
-    [LeftParen(), LeftParen(), RightParen(), 3, StringToken(value='foo'), 12]
+    (LeftParen(), LeftParen(), RightParen(), 3, StringToken(value='foo'), 12)
 
     >>> READ('abc "foo" +')
-    [Symbol(name='abc'), StringToken(value='foo'), Symbol(name='+')]
+    (Symbol(name='abc'), StringToken(value='foo'), Symbol(name='+'))
 
     >>> READ('(->>) 3 "foo" 12 66')
-    [LeftParen(), Symbol(name='->>'), RightParen(), 3, 12, 66]
+    (LeftParen(), Symbol(name='->>'), RightParen(), 3, StringToken(value='foo'), 12, 66)
     """
-    if source == "":
-        return []
-    elif source[0] == "(":
-        return [LeftParen()] + READ(source[1:])
-    elif source[0] == ")":
-        return [RightParen()] + READ(source[1:])
-    elif source[0] == '"':
-        string_token, leftover_source = read_str(source[1:])
-        return [string_token] + READ(leftover_source)
-    elif source[0] in "0123456789":
-        int_token, leftover_source = read_int(source)
-        return [int_token] + READ(leftover_source)
-    elif source[0] not in " \n\t,;()":
-        symbol_token, leftover_source = read_symbol(source)
-        return [symbol_token] + READ(leftover_source)
-    else:
-        return READ(source[1:])
-
-
-def EVAL(tokens: list[Token]) -> list[Token]:
+    tokens: list[Token] = []
+    index = 0
+    while index < len(source):
+        char = source[index]
+        if char == "(":
+            tokens.append(_LEFT_PAREN)
+            index += 1
+        elif char == ")":
+            tokens.append(_RIGHT_PAREN)
+            index += 1
+        elif char == '"':
+            string_token, index = read_str(source, index)
+            tokens.append(string_token)
+        elif char in "0123456789":
+            int_token, index = read_int(source, index)
+            tokens.append(int_token)
+        elif char not in " \n\t,;()":
+            symbol_token, index = read_symbol(source, index)
+            tokens.append(symbol_token)
+        else:
+            index += 1
+    return tuple(tokens)
+
+
+def EVAL(tokens: Iterable[Token]) -> Iterable[Token]:
     return tokens
 
 
-def PRINT(tokens: list[Token]) -> str:
+def PRINT(tokens: Iterable[Token]) -> str:
     """
     Given tokens, return a nicely formatted str of them
 
@@ -122,45 +151,18 @@ def PRINT(tokens: list[Token]) -> str:
     '(() ())'
     """
 
-    strs: list[str] = []
-    for index, current in enumerate(tokens):
-        previous = tokens[index - 1] if index > 0 else None
-
-        if preceed_with_space(previous, current):
-            strs.append(f" {current}")
-        else:
-            strs.append(str(current))
-
-    return "".join(strs)
+    space_before = preceed_with_space
+    return "".join(
+        f" {current}" if space_before(previous, current) else str(current)
+        for previous, current in pairwise(chain([None], tokens))
+    )
 
 
 def preceed_with_space(previous: Token | None, current: Token) -> bool:
-    if not previous:
-        return False
-
-    # `None` here means a non-paren token
-    previous_token_type = (
-        previous if isinstance(previous, LeftParen | RightParen)
-        else None
-    )
-    current_token_type = (
-        current if isinstance(current, LeftParen | RightParen)
-        else None
-    )
-
-    rules: dict[tuple[LeftParen | RightParen | None, LeftParen | RightParen | None], bool] = {
-        (None, LeftParen()): True,            # "something ("
-        (None, RightParen()): False,          # "something)"
-        (None, None): True,                   # "something something"
-        (LeftParen(), LeftParen()): False,    # "(("
-        (LeftParen(), RightParen()): False,   # "()"
-        (LeftParen(), None): False,           # "(something"
-        (RightParen(), LeftParen()): True,    # ") ("
-        (RightParen(), RightParen()): False,  # "))"
-        (RightParen(), None): True,           # ") something"
-    }
-
-    return rules[(previous_token_type, current_token_type)]
+    # A space goes between any two tokens, except after a "(" or before a ")"
+    return (previous is not None
+            and not isinstance(previous, LeftParen)
+            and not isinstance(current, RightParen))
 
 
 if __name__ == "__main__":